@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cached clock for date-folder lookups
+------------------------------------
+Used by monitor_temp_log.py, which resolves <base_dir>\\YYYYMMDD\\<log_filename>
+in its tail loop; the path only changes at midnight, so datetime.now() is
+re-sampled at most every CLOCK_RESOLUTION_SECONDS (gated on time.monotonic) and
+the computed path is reused until the date changes.
+Not for writers: the date can lag by up to CLOCK_RESOLUTION_SECONDS, so
+log_generator.py picks its folder from each line's own timestamp instead.
+"""
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+CLOCK_RESOLUTION_SECONDS = 0.5
+
+_last_clock_ts = 0.0
+_last_dt: Optional[datetime] = None
+_last_date_key = ""
+
+# compute function -> (date key + args, result) from its last cached_for_today call.
+_memo: Dict[Callable, Tuple[tuple, object]] = {}
+
+T = TypeVar("T")
+
+def now_cached() -> datetime:
+    r"""
+    Returns:
+        A local datetime at most CLOCK_RESOLUTION_SECONDS old.
+    """
+    global _last_clock_ts, _last_dt, _last_date_key
+    mono = time.monotonic()
+    if _last_dt is None or mono - _last_clock_ts >= CLOCK_RESOLUTION_SECONDS:
+        _last_dt = datetime.now()
+        _last_date_key = _last_dt.strftime("%Y%m%d")
+        _last_clock_ts = mono
+    return _last_dt
+
+def today_key_cached() -> str:
+    r"""
+    Returns:
+        The YYYYMMDD date folder name for now_cached().
+    """
+    now_cached()
+    return _last_date_key
+
+def cached_for_today(compute: Callable[..., T], *args) -> T:
+    r"""
+    Call compute(*args) once per local date and return the stored result until the
+    date or the arguments change.
+    Args:
+        compute: Path function whose result depends only on args and today's date.
+        *args: Arguments for compute; compared by equality on each call.
+    Returns:
+        The result of compute(*args) for today.
+    """
+    key = (today_key_cached(),) + args
+    hit = _memo.get(compute)
+    if hit is None or hit[0] != key:
+        hit = _memo[compute] = (key, compute(*args))
+    return hit[1]
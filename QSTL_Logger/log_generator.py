@@ -12,11 +12,22 @@ import json
 import os
 import random
 import sys
+import threading
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+try:
+    from .shm_ring import RingWriter
+except ImportError:  # run as a script from this folder
+    from shm_ring import RingWriter
+
+try:
+    import numpy as np
+except ImportError:  # optional: BatchedSampler falls back to the random module
+    np = None
+
 def load_config(path: Optional[Path]) -> dict:
     cfg = {}
     if path:
@@ -32,23 +43,61 @@ def load_config(path: Optional[Path]) -> dict:
     cfg.setdefault("spike_prob", 0.1)
     cfg.setdefault("spike_mean", 0.08)
     cfg.setdefault("spike_std", 0.01)
+    cfg.setdefault("batch_writes", False)
+    cfg.setdefault("fsync", False)
+    cfg.setdefault("shm_ring", None)
     return cfg
 
-def compute_path(base_dir: Optional[str], log_file: Optional[str], log_filename: str) -> Path:
+def compute_path(base_dir: Optional[str], log_file: Optional[str], log_filename: str,
+                 day: Optional[date] = None) -> Path:
     if log_file:
         return Path(log_file)
     if not base_dir:
         raise ValueError("Either --base-dir or --log-file must be provided (or via config).")
-    date_folder = datetime.now().strftime("%Y%m%d")
+    date_folder = (day or date.today()).strftime("%Y%m%d")
     return Path(base_dir) / date_folder / log_filename
 
 def ensure_parent(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
 
-def open_target(path: Path, append: bool, encoding: str):
-    ensure_parent(path)
-    mode = "a" if append else "w"
-    return open(path, mode, encoding=encoding, newline="")
+def _schedule_next_day_mkdir(base_dir: str, log_filename: str, run_now_if_late: bool = True) -> threading.Timer:
+    # Pre-create tomorrow's YYYYMMDD folder at 23:59 so the midnight rollover (here and
+    # in the monitor) finds the directory already there. Re-arms itself once a day.
+    now = datetime.now()
+    run_at = now.replace(hour=23, minute=59, second=0, microsecond=0)
+    if run_at <= now and not run_now_if_late:
+        run_at += timedelta(days=1)
+    delay = max(0.0, (run_at - now).total_seconds())
+
+    def run():
+        tomorrow = (date.today() + timedelta(days=1)).strftime("%Y%m%d")
+        try:
+            ensure_parent(Path(base_dir) / tomorrow / log_filename)
+        except OSError as e:
+            print(f"[generator] could not pre-create {tomorrow} folder: {e}", file=sys.stderr)
+        _schedule_next_day_mkdir(base_dir, log_filename, run_now_if_late=False)
+
+    timer = threading.Timer(delay, run)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+# Flush threshold for batch_writes: coalesced lines go out in one write(2) per 64 KiB.
+WRITE_BATCH_BYTES = 64 * 1024
+# With fsync enabled, the file is synced at most this often (plus on rollover/exit).
+FSYNC_INTERVAL_SECONDS = 1.0
+
+def open_target(path: Path, append: bool):
+    # Unbuffered binary handle: each line goes out as exactly one write(2) on an
+    # O_APPEND fd, so there is no separate flush and readers never see half a line.
+    # The folder is normally there already (pre-created at 23:59 for rollovers), so
+    # only mkdir when the open says it is missing.
+    mode = "ab" if append else "wb"
+    try:
+        return open(path, mode, buffering=0)
+    except FileNotFoundError:
+        ensure_parent(path)
+        return open(path, mode, buffering=0)
 
 def sample_value(mean: float, std: float, spike_prob: float, spike_mean: float, spike_std: float) -> float:
     if random.random() < spike_prob:
@@ -57,11 +106,57 @@ def sample_value(mean: float, std: float, spike_prob: float, spike_mean: float,
         v = random.gauss(mean, std)
     return max(0.0, v)
 
+class BatchedSampler:
+    r"""
+    Iterator over sample_value()-distributed floats, drawn `batch` at a time.
+    With NumPy a batch is one vectorized draw, so each line only costs a
+    next() on a list iterator; without it the batch is filled via sample_value.
+    """
+    def __init__(self, mean: float, std: float, spike_prob: float, spike_mean: float,
+                 spike_std: float, batch: int = 8192):
+        self.mean = mean
+        self.std = std
+        self.spike_prob = spike_prob
+        self.spike_mean = spike_mean
+        self.spike_std = spike_std
+        self.batch = batch
+        self._rng = np.random.default_rng() if np is not None else None
+        self._it = iter(())
+
+    def _draw(self) -> list:
+        if self._rng is None:
+            return [sample_value(self.mean, self.std, self.spike_prob, self.spike_mean, self.spike_std)
+                    for _ in range(self.batch)]
+        n = self._rng.standard_normal(self.batch)
+        spike = self._rng.random(self.batch) < self.spike_prob
+        vals = np.where(spike, self.spike_mean + self.spike_std * n, self.mean + self.std * n)
+        return vals.clip(0.0).tolist()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> float:
+        try:
+            return next(self._it)
+        except StopIteration:
+            self._it = iter(self._draw())
+            return next(self._it)
+
+# (second key, "DD-MM-YY, HH:MM:SS, ") for the last second format_line saw.
+_prefix_cache = (None, "")
+
 def format_line(ts: datetime, value: float) -> str:
     # DD-MM-YY, HH:MM:SS, 1.2345e-02
-    d = ts.strftime("%d-%m-%y")
-    t = ts.strftime("%H:%M:%S")
-    return f"{d}, {t}, {value:.5e}\n"
+    # monitor_temp_log skips lines that do not end in a digit, which %.5e guarantees;
+    # keep that in mind if the value format changes.
+    # The timestamp prefix only changes once per second, so it is reused until then.
+    global _prefix_cache
+    key = (ts.second, ts.minute, ts.hour, ts.day, ts.month, ts.year)
+    if key != _prefix_cache[0]:
+        prefix = "%02d-%02d-%02d, %02d:%02d:%02d, " % (
+            ts.day, ts.month, ts.year % 100, ts.hour, ts.minute, ts.second)
+        _prefix_cache = (key, prefix)
+    return "%s%.5e\n" % (_prefix_cache[1], value)
 
 def main(argv=None):
     p = argparse.ArgumentParser(description="Generate TempLog-style lines into YYYYMMDD/TempLog.txt")
@@ -79,6 +174,9 @@ def main(argv=None):
     p.add_argument("--spike-prob", type=float, help="spike probability (0.0 to 1.0, e.g. 0.1)")
     p.add_argument("--spike-mean", type=float, help="spike mean value (e.g. 0.08)")
     p.add_argument("--spike-std", type=float, help="spike std (e.g. 0.01)")
+    p.add_argument("--batch-writes", action="store_true", help="Coalesce lines into 64 KiB writes while not sleeping between lines")
+    p.add_argument("--fsync", action="store_true", help="fsync the log file about once per second for durability")
+    p.add_argument("--shm-ring", help="Also publish lines to this shared-memory ring file (e.g. /dev/shm/templog.ringbuf)")
 
     args = p.parse_args(argv)
 
@@ -96,6 +194,9 @@ def main(argv=None):
     if args.spike_prob is not None: cfg["spike_prob"] = args.spike_prob
     if args.spike_mean is not None: cfg["spike_mean"] = args.spike_mean
     if args.spike_std is not None: cfg["spike_std"] = args.spike_std
+    if args.batch_writes: cfg["batch_writes"] = True
+    if args.fsync: cfg["fsync"] = True
+    if args.shm_ring: cfg["shm_ring"] = args.shm_ring
 
     base_dir = cfg.get("base_dir")
     log_file = cfg.get("log_file")
@@ -103,6 +204,9 @@ def main(argv=None):
     interval = float(cfg.get("interval_seconds", 1.0))
     encoding = cfg.get("encoding", "utf-8")
     append = bool(cfg.get("append", True))
+    batch_writes = bool(cfg.get("batch_writes", False))
+    fsync = bool(cfg.get("fsync", False))
+    shm_ring = cfg.get("shm_ring")
 
     mean = float(cfg.get("mean", 0.01))
     std = float(cfg.get("std", 0.002))
@@ -110,32 +214,69 @@ def main(argv=None):
     spike_mean = float(cfg.get("spike_mean", 0.08))
     spike_std = float(cfg.get("spike_std", 0.01))
 
+    sampler = BatchedSampler(mean, std, spike_prob, spike_mean, spike_std)
+
     target_lines = int(args.lines or 0)
     max_duration = float(args.duration or 0.0)
     start_time = time.time()
 
-    current_path = compute_path(base_dir, log_file, log_filename)
-    f = open_target(current_path, append=append, encoding=encoding)
+    # The folder follows each line's own timestamp, so a line stamped after midnight
+    # never lands in yesterday's file; the path is only rebuilt when that date changes.
+    current_day = date.today()
+    current_path = compute_path(base_dir, log_file, log_filename, current_day)
+    f = open_target(current_path, append=append)
     print(f"[generator] writing to: {current_path} (append={append})")
+    if base_dir and not log_file:
+        _schedule_next_day_mkdir(base_dir, log_filename)
+    ring = RingWriter(Path(shm_ring)) if shm_ring else None
+    if ring:
+        print(f"[generator] publishing to shared ring: {shm_ring}")
 
+    # With batch_writes, lines accumulate here and are written only when the buffer
+    # is full or the loop is about to sleep, so a burst (--interval 0) makes one
+    # syscall per WRITE_BATCH_BYTES instead of one per line. Paced runs still
+    # publish every line before sleeping.
+    pending = bytearray()
+    # A terminal is already line-buffered; only pipes/files need an explicit flush.
+    flush_stdout = not sys.stdout.isatty()
+    last_fsync = time.monotonic()
     wrote = 0
     try:
         while True:
             ts = datetime.now()
 
-            new_path = compute_path(base_dir, log_file, log_filename)
-            if new_path != current_path:
-                f.close()
-                current_path = new_path
-                f = open_target(current_path, append=True, encoding=encoding)
-                print(f"[generator] rolled over to: {current_path}")
+            if ts.date() != current_day:
+                current_day = ts.date()
+                new_path = compute_path(base_dir, log_file, log_filename, current_day)
+                if new_path != current_path:
+                    if pending:
+                        f.write(pending)
+                        pending.clear()
+                    if fsync:
+                        os.fsync(f.fileno())
+                    f.close()
+                    current_path = new_path
+                    f = open_target(current_path, append=True)
+                    print(f"[generator] rolled over to: {current_path}")
 
-            value = sample_value(mean, std, spike_prob, spike_mean, spike_std)
+            value = next(sampler)
             line = format_line(ts, value)
-            f.write(line)
-            f.flush()
+            data = line.encode(encoding)
+            if batch_writes:
+                pending += data
+                if len(pending) >= WRITE_BATCH_BYTES or interval > 0:
+                    f.write(pending)
+                    pending.clear()
+            else:
+                f.write(data)
+            if ring:
+                ring.write(data)
+            if fsync and time.monotonic() - last_fsync >= FSYNC_INTERVAL_SECONDS:
+                os.fsync(f.fileno())
+                last_fsync = time.monotonic()
             sys.stdout.write(line)
-            sys.stdout.flush()
+            if flush_stdout:
+                sys.stdout.flush()
 
             wrote += 1
             if target_lines and wrote >= target_lines:
@@ -148,9 +289,15 @@ def main(argv=None):
         print("\n[generator] stopped by user.")
     finally:
         try:
+            if pending:
+                f.write(pending)
+            if fsync:
+                os.fsync(f.fileno())
             f.close()
         except Exception:
             pass
+        if ring:
+            ring.close()
 
 if __name__ == "__main__":
     sys.exit(main())
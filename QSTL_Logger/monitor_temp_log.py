@@ -22,34 +22,57 @@ Config JSON (minimal example):
       "host": "smtp.gmail.com",
       "port": 587,
       "username": "your@gmail.com",
-      "password": "SMTP_PASS"    // google app password
+      "password": "SMTP_PASS",   // google app password
+      "max_messages_per_connection": 100  // (optional) recycle the pooled connection after N sends
     }
   },
   "poll_interval_seconds": 1.0,          // (optional) tail poll interval
+  "tail_spin_budget_us": 0,              // (optional) CPU time to busy-peek for writes before blocking
   "start_from_beginning": false,         // (optional) default: false (start at end-of-file)
-  "resend_cooldown_seconds": 300         // (optional) minimum seconds between alert emails
+  "resend_cooldown_seconds": 300,        // (optional) minimum seconds between alert emails
+  "alert_batch_window_seconds": 2.0,     // (optional) violations within this window share one email
+  "alert_rate_limit": {"per_minute": 6, "burst": 2}  // (optional) hard cap on alert emails
 }
 
 You may alternatively provide a fixed absolute path to a single file via:
   "log_file": "D:\\\\Logs\\\\20250908\\\\TempLog.txt"
 If "log_file" is present, the program watches exactly that file and does not rotate by date.
 
+When the generator runs on the same host with --shm-ring, setting
+  "shm_ring": "/dev/shm/templog.ringbuf"
+makes the monitor read new lines from that shared-memory ring instead of tailing the file.
+
 The program assumes a dated folder scheme:
   <base_dir>\\YYYYMMDD\\TempLog.txt
 and will automatically roll over at midnight to the new day's file if "log_file" is not given.
 """
 import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import functools
 import json
 import logging
 import os
 import re
+import select
 import smtplib
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from email.message import EmailMessage
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+try:
+    from .daily_path import cached_for_today, today_key_cached
+    from .shm_ring import RingOverrunError, RingReader
+except ImportError:  # run as a script from this folder
+    from daily_path import cached_for_today, today_key_cached
+    from shm_ring import RingOverrunError, RingReader
 
 def setup_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
@@ -83,9 +106,97 @@ def load_config(path: Path) -> dict:
     cfg.setdefault("poll_interval_seconds", 1.0)
     cfg.setdefault("start_from_beginning", False)
     cfg.setdefault("resend_cooldown_seconds", 300)
+    cfg.setdefault("alert_batch_window_seconds", 2.0)
     cfg.setdefault("encoding", "utf-8")
+    cfg.setdefault("shm_ring", None)
+    cfg.setdefault("tail_spin_budget_us", 0)
+    cfg.setdefault("alert_rate_limit", {"per_minute": 6, "burst": 2})
     return cfg
 
+class PipeliningSMTP(smtplib.SMTP):
+    r"""
+    smtplib.SMTP that pipelines MAIL/RCPT/DATA (RFC 2920) when the server
+    advertises PIPELINING, so a message costs two round trips instead of one
+    per command. Without the extension the stock sendmail is used.
+    """
+    def _drain_replies(self, count: int) -> list:
+        r"""
+        Read replies for pipelined commands, in order.
+        Args:
+            count: Number of replies to read.
+        Returns:
+            List of (code, message) tuples.
+        """
+        return [self.getreply() for _ in range(count)]
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining"):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode("ascii")
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        esmtp_opts = []
+        if self.has_extn("size"):
+            esmtp_opts.append("size=%d" % len(msg))
+        esmtp_opts.extend(mail_options)
+        if any(x.lower() == "smtputf8" for x in esmtp_opts):
+            if not self.has_extn("smtputf8"):
+                raise smtplib.SMTPNotSupportedError("SMTPUTF8 not supported by server")
+            self.command_encoding = "utf-8"
+        mail_args = " " + " ".join(esmtp_opts) if esmtp_opts else ""
+        rcpt_args = " " + " ".join(rcpt_options) if rcpt_options else ""
+
+        cmds = ["MAIL FROM:%s%s" % (smtplib.quoteaddr(from_addr), mail_args)]
+        cmds += ["RCPT TO:%s%s" % (smtplib.quoteaddr(addr), rcpt_args) for addr in to_addrs]
+        cmds.append("DATA")
+        self.send("".join(c + smtplib.CRLF for c in cmds))
+        replies = self._drain_replies(len(cmds))
+
+        mail_code, mail_resp = replies[0]
+        data_code, data_resp = replies[-1]
+        senderrs = {}
+        for addr, (code, resp) in zip(to_addrs, replies[1:-1]):
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+
+        if 421 in (code for code, _ in replies):
+            self.close()
+            if mail_code != 250:
+                raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+            if senderrs:
+                raise smtplib.SMTPRecipientsRefused(senderrs)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        if mail_code != 250 or len(senderrs) == len(to_addrs):
+            if data_code == 354:
+                # Broken server opened DATA anyway; end it empty before resetting.
+                self.send(b"." + smtplib.bCRLF)
+                self.getreply()
+            self._rset()
+            if mail_code != 250:
+                raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+
+        if data_code != 354:
+            self._rset()
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        q = smtplib._quote_periods(msg)
+        if q[-2:] != smtplib.bCRLF:
+            q = q + smtplib.bCRLF
+        self.send(q + b"." + smtplib.bCRLF)
+        code, resp = self.getreply()
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
 def open_mailer(smtp_cfg: dict) -> smtplib.SMTP:
     r"""
     Open and login to an SMTP server based on config.
@@ -105,7 +216,7 @@ def open_mailer(smtp_cfg: dict) -> smtplib.SMTP:
         raise ValueError("email.smtp.username is required in config")
     if not "password" in smtp_cfg:
         raise ValueError("email.smtp.password or password_env_var is required in config")
-    server = smtplib.SMTP(host, port, timeout=30)
+    server = PipeliningSMTP(host, port, timeout=30)
     server.starttls()
     try:
         server.login(username, password or "")
@@ -115,15 +226,213 @@ def open_mailer(smtp_cfg: dict) -> smtplib.SMTP:
         raise
     return server
 
-def send_email_alert(cfg: dict, value: float, line: str, log_path: Path) -> None:
+# Pooled SMTP connection shared by all alerts; guarded by _mailer_lock.
+# Its socket I/O is plain blocking smtplib and only ever runs on the
+# AlertDispatcher's sender thread, so the tail loop never waits on it.
+_mailer: Optional[smtplib.SMTP] = None
+_mailer_sent = 0
+_mailer_lock = threading.Lock()
+
+# Socket timeout for the NOOP liveness probe; a dead relay should fail fast here
+# rather than after the 30s command timeout.
+MAILER_NOOP_TIMEOUT = 5.0
+
+def _mailer_alive(server: smtplib.SMTP) -> bool:
     r"""
-    Send an email alert about threshold exceedance.
+    Probe a pooled connection with NOOP.
+    Args:
+        server: Open SMTP connection.
+    Returns:
+        True if the server answered 250.
+    """
+    try:
+        server.sock.settimeout(MAILER_NOOP_TIMEOUT)
+        code, _ = server.noop()
+        server.sock.settimeout(server.timeout)
+    except (smtplib.SMTPException, OSError, AttributeError):
+        return False
+    return code == 250
+
+def _discard_mailer() -> None:
+    r"""
+    Close and forget the pooled connection. Caller must hold _mailer_lock.
+    """
+    global _mailer, _mailer_sent
+    server, _mailer, _mailer_sent = _mailer, None, 0
+    if server is not None:
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+def get_or_open_mailer(smtp_cfg: dict) -> smtplib.SMTP:
+    r"""
+    Return the pooled SMTP connection, opening it on first use.
+    The connection is reopened if it fails a NOOP probe or has already carried
+    email.smtp.max_messages_per_connection messages (default 100).
+    Caller must hold _mailer_lock.
+    Args:
+        smtp_cfg: SMTP configuration dictionary.
+    Returns:
+        A logged-in smtplib.SMTP instance.
+    """
+    global _mailer, _mailer_sent
+    max_messages = int(smtp_cfg.get("max_messages_per_connection", 100))
+    if _mailer is not None and (_mailer_sent >= max_messages or not _mailer_alive(_mailer)):
+        logging.debug("Recycling SMTP connection after %d message(s)", _mailer_sent)
+        _discard_mailer()
+    if _mailer is None:
+        _mailer = open_mailer(smtp_cfg)
+        _mailer_sent = 0
+    return _mailer
+
+def close_mailer() -> None:
+    r"""
+    Quit the pooled SMTP connection, if any.
+    """
+    with _mailer_lock:
+        _discard_mailer()
+
+def deliver_message(smtp_cfg: dict, msg: EmailMessage) -> None:
+    r"""
+    Send a message over the pooled SMTP connection.
+    Args:
+        smtp_cfg: SMTP configuration dictionary.
+        msg: Message to send.
+    """
+    global _mailer_sent
+    with _mailer_lock:
+        server = get_or_open_mailer(smtp_cfg)
+        try:
+            server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            _discard_mailer()
+            raise
+        except smtplib.SMTPException:
+            # A reply error (e.g. 550 for a recipient): smtplib has already sent RSET,
+            # so the session is still usable. SMTPException subclasses OSError, hence
+            # this clause before the socket-level one.
+            raise
+        except OSError:
+            _discard_mailer()
+            raise
+        _mailer_sent += 1
+
+class CircuitOpenError(RuntimeError):
+    r"""Raised by CircuitBreaker.call while the circuit is open."""
+
+class CircuitBreaker:
+    r"""
+    Closed/open/half_open circuit breaker.
+    The circuit opens after failure_threshold failures within failure_window
+    seconds, rejecting calls with CircuitOpenError. Once half_open_timeout
+    seconds have passed a single probe call is let through: success closes the
+    circuit, failure opens it again. Transitions use time.monotonic.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, failure_window: float = 60.0,
+                 half_open_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.half_open_timeout = half_open_timeout
+        self.state = self.CLOSED
+        self._failures = deque()
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, fn, *args, **kwargs):
+        r"""
+        Invoke fn(*args, **kwargs) through the breaker.
+        Returns:
+            Whatever fn returns.
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already running.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.half_open_timeout:
+                    raise CircuitOpenError("circuit open")
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                raise CircuitOpenError("circuit half-open, probe in progress")
+            probing = self.state == self.HALF_OPEN
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._record_failure(probing)
+            raise
+        self._record_success()
+        return result
+
+    def _record_failure(self, probing: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not probing:
+                self._failures.append(now)
+                while self._failures and now - self._failures[0] > self.failure_window:
+                    self._failures.popleft()
+                if len(self._failures) < self.failure_threshold:
+                    return
+            self.state = self.OPEN
+            self._opened_at = now
+            self._failures.clear()
+        logging.warning("Circuit opened; rejecting calls for %.0fs", self.half_open_timeout)
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info("Circuit closed")
+            self.state = self.CLOSED
+            self._failures.clear()
+
+_smtp_breaker = CircuitBreaker()
+
+class TokenBucket:
+    r"""
+    Token bucket rate limiter holding up to `burst` tokens, refilled at
+    rate_per_sec. Uses time.monotonic.
+    """
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = rate_per_sec
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        r"""
+        Take tokens from the bucket if enough are available.
+        Args:
+            tokens: Number of tokens to take.
+        Returns:
+            True if the tokens were taken, False if the caller is over the rate.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+def send_email_alert(cfg: dict, hits: List[Tuple[float, str]], log_path: Path,
+                     total: Optional[int] = None, peak: Optional[float] = None) -> None:
+    r"""
+    Send one email alert covering one or more threshold exceedances.
     Args:
         cfg: Configuration dictionary.
-        value: The numeric value that exceeded the threshold.
-        line: The full log line containing the value.
+        hits: (value, line) pairs for the exceeding log lines to quote, oldest first.
         log_path: Path to the log file being monitored.
+        total: Number of exceedances the alert covers (default len(hits)); the
+            ones beyond hits are summarised as "... and K more".
+        peak: Highest exceeding value (default the highest in hits).
+    Raises:
+        CircuitOpenError: If the SMTP circuit is open and the alert was dropped.
     """
+    value = peak if peak is not None else max(v for v, _ in hits)
+    total = total if total is not None else len(hits)
     email_cfg = cfg["email"]
     smtp_cfg = email_cfg["smtp"]
     sender = email_cfg.get("sender", "Temp Monitor <no-reply@example.com>")
@@ -135,8 +444,13 @@ def send_email_alert(cfg: dict, value: float, line: str, log_path: Path) -> None
         f"Threshold: {cfg['threshold']} K\n"
         f"Value:     {value} K\n"
         f"File:      {log_path}\n"
-        f"Line:      {line.strip()}\n"
     )
+    if total == 1:
+        body += f"Line:      {hits[0][1].strip()}\n"
+    else:
+        body += f"Lines ({total}):\n" + "".join(f"  {line.strip()}\n" for _, line in hits)
+        if total > len(hits):
+            body += f"  ... and {total - len(hits)} more\n"
 
     msg = EmailMessage()
     msg["From"] = sender
@@ -144,20 +458,73 @@ def send_email_alert(cfg: dict, value: float, line: str, log_path: Path) -> None
     msg["Subject"] = subject
     msg.set_content(body)
 
-    server = None
-    try:
-        server = open_mailer(smtp_cfg)
-        server.send_message(msg)
-        logging.info("Alert email sent to %s", cfg["recipients"])
-    finally:
-        if server:
-            try:
-                server.quit()
-            except Exception:
-                pass
+    _smtp_breaker.call(deliver_message, smtp_cfg, msg)
+    logging.info("Alert email sent to %s", cfg["recipients"])
 
 _FLOAT_RE = re.compile(r"[-+]?(?:\d*\.?\d+|\d+\.)(?:[eE][-+]?\d+)?")
 
+_FLOAT_CHARS = frozenset("0123456789.eE+-")
+_DIGITS = frozenset("0123456789")
+
+def _float_end(s: str, p: int, n: int) -> int:
+    r"""
+    Match the _FLOAT_RE grammar at s[p:n] by hand.
+    Returns:
+        End index of the float literal starting at p, or -1 if none starts there.
+    """
+    q = p + 1 if s[p] in "+-" else p
+    a = q
+    while a < n and s[a] in _DIGITS:
+        a += 1
+    if a + 1 < n and s[a] == "." and s[a + 1] in _DIGITS:
+        b = a + 2
+        while b < n and s[b] in _DIGITS:
+            b += 1
+    elif a > q:
+        b = a
+    else:
+        return -1
+    if b < n and s[b] in "eE":
+        c = b + 1
+        if c < n and s[c] in "+-":
+            c += 1
+        if c < n and s[c] in _DIGITS:
+            while c < n and s[c] in _DIGITS:
+                c += 1
+            b = c
+    return b
+
+def _rfind_float(s: str) -> Optional[float]:
+    r"""
+    Find the rightmost float literal in s (same result as the last _FLOAT_RE
+    match) without building a list of every match. Runs of float characters
+    are visited right-to-left; the first run containing a literal decides.
+    Args:
+        s: Text to scan.
+    Returns:
+        The parsed float value, or None if s contains none.
+    """
+    end = len(s)
+    while end > 0:
+        while end > 0 and s[end - 1] not in _FLOAT_CHARS:
+            end -= 1
+        start = end
+        while start > 0 and s[start - 1] in _FLOAT_CHARS:
+            start -= 1
+        last = -1
+        p = start
+        while p < end:
+            e = _float_end(s, p, end)
+            if e < 0:
+                p += 1
+            else:
+                last, last_end = p, e
+                p = e
+        if last >= 0:
+            return float(s[last:last_end])
+        end = start
+    return None
+
 def extract_rightmost_float(line: str) -> Optional[float]:
     r"""
     Try to parse the rightmost numeric token in a comma-separated line.
@@ -171,6 +538,14 @@ def extract_rightmost_float(line: str) -> Optional[float]:
     if not line:
         return None
 
+    # Fast path: well-formed lines end in ", <float>", so parse the text after the
+    # last comma directly (float() tolerates the surrounding spaces).
+    s = line.rstrip()
+    try:
+        return float(s[s.rfind(",") + 1:])
+    except ValueError:
+        pass
+
     # Prefer comma split; fall back to regex search if needed.
     parts = [p.strip() for p in line.strip().split(",")]
     for token in reversed(parts):
@@ -186,10 +561,7 @@ def extract_rightmost_float(line: str) -> Optional[float]:
                     pass
 
     # As a last resort, look anywhere in the line (right-to-left) for a float.
-    matches = list(_FLOAT_RE.finditer(line))
-    if matches:
-        return float(matches[-1].group(0))
-    return None
+    return _rfind_float(line)
 
 # ----------------------------- File handling ------------------------------
 
@@ -209,107 +581,400 @@ def compute_log_path(cfg: dict) -> Path:
     if not base_dir:
         raise ValueError("Either 'log_file' or 'base_dir' must be specified in config")
 
-    date_folder = datetime.now().strftime("%Y%m%d")
+    date_folder = today_key_cached()
     return Path(base_dir) / date_folder / cfg.get("log_filename", "TempLog.txt")
 
-def wait_for_file(path: Path, poll_interval: float) -> None:
+def compute_log_path_cached(cfg: dict) -> Path:
+    r"""
+    compute_log_path, recomputed only when the local date or cfg changes.
+    Args:
+        cfg: Configuration dictionary.
+    Returns:
+        Path to the log file to monitor.
+    """
+    return cached_for_today(compute_log_path, cfg)
+
+def wait_for_file(path: Path, poll_interval: float, sleep=time.sleep) -> None:
     r"""
     Wait until the specified file exists.
     Args:
         path: Path to the file.
         poll_interval: Seconds between existence checks.
+        sleep: Function used to wait between checks (e.g. AlertDispatcher.sleep).
     """
     while not path.exists():
         logging.info("Waiting for log file to appear: %s", path)
-        time.sleep(poll_interval)
+        sleep(poll_interval)
+
+_IN_MODIFY = 0x00000002
+_IN_MOVE_SELF = 0x00000800
+_IN_DELETE_SELF = 0x00000400
+
+def _inotify_watch(path: Path) -> int:
+    r"""
+    Create a non-blocking inotify fd watching path for writes, moves and deletion.
+    Args:
+        path: Path to the file to watch.
+    Returns:
+        The inotify file descriptor.
+    Raises:
+        OSError: If libc or the kernel refuses the watch.
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    wd = libc.inotify_add_watch(fd, os.fsencode(path), _IN_MODIFY | _IN_MOVE_SELF | _IN_DELETE_SELF)
+    if wd < 0:
+        err = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(err, "inotify_add_watch failed", str(path))
+    return fd
+
+# Upper bound on non-blocking event-queue peeks per FileChangeWaiter.wait.
+_MAX_SPIN_PEEKS = 16
+# inotify events for a file watch carry no name, so one read of this size drains
+# hundreds of them.
+_EVENT_BUF_BYTES = 4096
+
+class FileChangeWaiter:
+    r"""
+    Block until a file changes or a timeout elapses.
+    On Linux an inotify watch wakes the caller as soon as the writer appends;
+    elsewhere (or if inotify is unavailable) this degrades to a plain sleep.
+    Args:
+        path: File to watch.
+        spin_budget_us: Microseconds wait() may spend peeking the event queue
+            before blocking in select(); 0 peeks once.
+    """
+    def __init__(self, path: Path, spin_budget_us: float = 0.0):
+        self.spin_budget = spin_budget_us / 1e6
+        self._fd = -1
+        if sys.platform.startswith("linux"):
+            try:
+                self._fd = _inotify_watch(path)
+            except (OSError, AttributeError) as e:
+                logging.debug("inotify unavailable, falling back to polling: %s", e)
+
+    def wait(self, timeout: float) -> None:
+        r"""
+        Wait for a change notification or until timeout seconds have passed.
+        Args:
+            timeout: Maximum seconds to block.
+        """
+        if self._fd < 0:
+            time.sleep(timeout)
+            return
+        # Peek the event queue before blocking, as cowsql/raft polls its io_uring
+        # completion queue before io_uring_enter: under a busy writer events are
+        # already queued and the select() call and its wakeup are skipped.
+        deadline = time.perf_counter() + self.spin_budget
+        for _ in range(_MAX_SPIN_PEEKS):
+            if self._drain():
+                return
+            if time.perf_counter() >= deadline:
+                break
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            self._drain()
+
+    def _drain(self) -> bool:
+        r"""
+        Consume queued events without blocking; one wakeup is enough to re-read the file.
+        Returns:
+            True if any events were queued.
+        """
+        try:
+            while len(os.read(self._fd, _EVENT_BUF_BYTES)) == _EVENT_BUF_BYTES:
+                pass
+        except BlockingIOError:
+            return False
+        return True
 
-def tail_file(f, poll_interval: float):
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+# Bytes requested per read(2) in tail_file. Catch-up throughput is flat from
+# 16 KiB to 128 KiB; 64 KiB keeps the syscall count per burst low.
+READ_CHUNK_BYTES = 64 * 1024
+
+def tail_file(f, poll_interval: float, encoding: str = "utf-8",
+              waiter: Optional[FileChangeWaiter] = None):
     """
-    Generator that yields new lines appended to file f, similar to 'tail -f'.
+    Generator that yields new lines appended to binary file f, similar to 'tail -f'.
+    f may also be a shm_ring.RingReader; only f.read(size) is used.
+    Reads READ_CHUNK_BYTES at a time and splits lines in userspace; a trailing
+    partial line is held back until its newline arrives. Lines are yielded
+    decoded and without the newline; None is yielded after each idle wait so
+    the caller can run timers while no data arrives.
+    When a waiter is given, an empty read blocks on it (up to poll_interval)
+    instead of sleeping the full interval.
+    If a RingReader reports an overrun, the held-back partial line is dropped so
+    it is not glued onto the next complete line.
     """
+    buf = bytearray()
     while True:
-        where = f.tell()
-        line = f.readline()
-        if not line:
-            time.sleep(poll_interval)
-            f.seek(where)
-        else:
-            yield line
+        try:
+            chunk = f.read(READ_CHUNK_BYTES)
+        except RingOverrunError:
+            buf.clear()
+            continue
+        if not chunk:
+            if waiter is not None:
+                waiter.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+            yield None
+            continue
+        buf += chunk
+        end = buf.rfind(b"\n")
+        if end < 0:
+            continue
+        # Decode complete lines in one call; a newline byte is always a character
+        # boundary in the ASCII-compatible encodings TempLog uses.
+        text = buf[:end].decode(encoding, errors="replace")
+        del buf[:end + 1]
+        yield from text.split("\n")
+
+# Alert emails allowed to be queued or in flight on the sender thread at once.
+MAX_PENDING_ALERTS = 4
+
+# Violation lines quoted in one alert email; the rest of the batch is only counted.
+MAX_LINES_PER_ALERT = 20
+
+def _send_alert_job(cfg: dict, hits: List[Tuple[float, str]], log_path: Path,
+                    total: int, peak: float, slots: threading.BoundedSemaphore) -> bool:
+    r"""
+    Sender-thread wrapper around send_email_alert that logs failures and frees
+    the caller's queue slot.
+    Returns:
+        True if the alert was delivered.
+    """
+    try:
+        send_email_alert(cfg, hits, log_path, total, peak)
+    except CircuitOpenError:
+        logging.warning("SMTP circuit open; dropping alert for %d violation(s)", total)
+        return False
+    except Exception as e:
+        logging.error("Failed to send alert email: %s", e)
+        return False
+    finally:
+        slots.release()
+    return True
+
+class AlertDispatcher:
+    r"""
+    Turns threshold violations into alert emails.
+    The first violation opens a batch window of alert_batch_window_seconds;
+    later violations inside it join the same email, which quotes the first
+    MAX_LINES_PER_ALERT lines and counts the rest. When the window closes the
+    batch is checked against the cooldown and rate limit and handed to a single
+    sender thread, so a slow relay never stalls tailing.
+    """
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        self.cooldown = float(cfg.get("resend_cooldown_seconds", 300))
+        self.batch_window = float(cfg.get("alert_batch_window_seconds", 2.0))
+        rate_cfg = cfg.get("alert_rate_limit", {})
+        # Second line of defence next to the cooldown: caps outbound email regardless of log content.
+        self.bucket = TokenBucket(float(rate_cfg.get("per_minute", 6)) / 60.0, float(rate_cfg.get("burst", 2)))
+        self.last_alert_ts = 0.0
+        self.pending: List[Tuple[float, str]] = []
+        self.pending_count = 0
+        self.pending_peak = 0.0
+        self.pending_deadline = 0.0
+        self.log_path: Optional[Path] = None
+        self._sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-mailer")
+        self._slots = threading.BoundedSemaphore(MAX_PENDING_ALERTS)
+        # Guards last_alert_ts, which the sender thread rolls back on failure.
+        self._lock = threading.Lock()
+
+    def add(self, value: float, line: str, log_path: Path) -> None:
+        r"""
+        Queue a violation for the current batch, opening a batch window if needed.
+        Args:
+            value: The numeric value that exceeded the threshold.
+            line: The full log line containing the value.
+            log_path: Path to the log file being monitored.
+        """
+        if len(self.pending) < MAX_LINES_PER_ALERT:
+            self.pending.append((value, line))
+        if not self.pending_count or value > self.pending_peak:
+            self.pending_peak = value
+        self.pending_count += 1
+        self.log_path = log_path
+        if not self.pending_deadline:
+            self.pending_deadline = time.monotonic() + self.batch_window
+
+    def poll(self) -> None:
+        r"""
+        Flush the pending batch if its window has closed.
+        """
+        if self.pending_deadline and time.monotonic() >= self.pending_deadline:
+            self.flush()
+
+    def sleep(self, seconds: float) -> None:
+        r"""
+        time.sleep that still flushes a pending batch whose window closes meanwhile.
+        Args:
+            seconds: Seconds to sleep.
+        """
+        end = time.monotonic() + seconds
+        while True:
+            self.poll()
+            now = time.monotonic()
+            if now >= end:
+                return
+            wake = min(end, self.pending_deadline) if self.pending_deadline else end
+            time.sleep(max(0.0, wake - now))
+
+    def flush(self) -> None:
+        r"""
+        Send the pending batch as one email, subject to cooldown and rate limit.
+        """
+        hits, total, peak = self.pending, self.pending_count, self.pending_peak
+        self.pending, self.pending_count = [], 0
+        self.pending_deadline = 0.0
+        if not total:
+            return
+        now_ts = time.time()
+        with self._lock:
+            last_alert_ts = self.last_alert_ts
+        if now_ts - last_alert_ts < self.cooldown:
+            logging.info(
+                "Threshold exceeded %d time(s) but within cooldown (%.1fs remaining).",
+                total,
+                self.cooldown - (now_ts - last_alert_ts)
+            )
+            return
+        # Take a sender slot before a token so a backlog drop doesn't spend rate budget.
+        if not self._slots.acquire(blocking=False):
+            logging.warning("Alert sender backlogged; dropping alert for %d violation(s)", total)
+            return
+        if not self.bucket.try_consume():
+            self._slots.release()
+            logging.info("Alert rate limit reached; not sending alert for %d violation(s)", total)
+            return
+        # Start the cooldown now so batches closing while this one is in flight are
+        # suppressed; _on_sent undoes it if the send fails.
+        with self._lock:
+            self.last_alert_ts = now_ts
+        future = self._sender.submit(_send_alert_job, self.cfg, hits, self.log_path, total, peak, self._slots)
+        future.add_done_callback(functools.partial(self._on_sent, sent_ts=now_ts, prev_ts=last_alert_ts))
+
+    def _on_sent(self, future: Future, sent_ts: float, prev_ts: float) -> None:
+        r"""
+        Done-callback for a send job: roll the cooldown back if the alert was not
+        delivered, so the next violation retries.
+        """
+        if not future.cancelled() and future.result():
+            return
+        with self._lock:
+            if self.last_alert_ts == sent_ts:
+                self.last_alert_ts = prev_ts
+
+    def close(self) -> None:
+        r"""
+        Stop the sender thread. An in-flight send may finish; queued alerts and
+        any open batch are dropped.
+        """
+        self._sender.shutdown(wait=True, cancel_futures=True)
 
 def monitor(cfg: dict) -> None:
     r"""
-    Main monitoring loop.
+    Main monitoring loop. Violations are batched and sent by an AlertDispatcher
+    so tailing continues while the SMTP relay is slow.
     Args:
         cfg: Configuration dictionary.
     """
     threshold = float(cfg["threshold"])
     poll_interval = float(cfg.get("poll_interval_seconds", 1.0))
     start_from_beginning = bool(cfg.get("start_from_beginning", False))
-    cooldown = float(cfg.get("resend_cooldown_seconds", 300))
     encoding = cfg.get("encoding", "utf-8")
+    ring_path = cfg.get("shm_ring")
+    spin_budget_us = float(cfg.get("tail_spin_budget_us", 0))
 
-    last_alert_ts = 0.0
-    current_path = compute_log_path(cfg)
+    current_path = compute_log_path_cached(cfg)
     logging.info("Initial target file: %s", current_path)
 
-    while True:
-        # Handle date rollover if using base_dir
-        target_path = compute_log_path(cfg)
-        if target_path != current_path:
-            logging.info("Date rollover detected. Switching file to: %s", target_path)
-            current_path = target_path
+    alerts = AlertDispatcher(cfg)
+    try:
+        while True:
+            # Tailing may have stopped with a batch window open; don't let it wait for new lines.
+            alerts.poll()
 
-        wait_for_file(current_path, poll_interval)
+            # Handle date rollover if using base_dir
+            target_path = compute_log_path_cached(cfg)
+            if target_path != current_path:
+                logging.info("Date rollover detected. Switching file to: %s", target_path)
+                current_path = target_path
 
-        try:
-            with current_path.open("r", encoding=encoding, errors="replace") as f:
-                if not start_from_beginning:
-                    f.seek(0, os.SEEK_END)
-                logging.info(
-                    "Monitoring file: %s (start_from_beginning=%s)",
-                    current_path,
-                    start_from_beginning
-                )
-
-                for line in tail_file(f, poll_interval):
-                    # If date changed while tailing, break to reopen new file
-                    new_target = compute_log_path(cfg)
-                    if new_target != current_path:
-                        logging.info("Date rollover while tailing. Switching to: %s", new_target)
-                        current_path = new_target
-                        break
-
-                    value = extract_rightmost_float(line)
-                    if value is None:
-                        logging.debug("No numeric value found in line (skipped): %s", line.strip())
-                        continue
-
-                    logging.debug("Parsed value: %s | line: %s", value, line.strip())
-
-                    if value > threshold:
-                        now_ts = time.time()
-                        if now_ts - last_alert_ts >= cooldown:
+            wait_for_file(Path(ring_path) if ring_path else current_path, poll_interval, alerts.sleep)
+
+            try:
+                if ring_path:
+                    # The ring carries every day's lines, so rollover only changes current_path.
+                    f = waiter = RingReader(ring_path, from_start=start_from_beginning)
+                else:
+                    f = current_path.open("rb", buffering=0)
+                    waiter = FileChangeWaiter(current_path, spin_budget_us)
+                with f, contextlib.closing(waiter):
+                    if not ring_path and not start_from_beginning:
+                        f.seek(0, os.SEEK_END)
+                    logging.info(
+                        "Monitoring %s: %s (start_from_beginning=%s)",
+                        "shared ring" if ring_path else "file",
+                        ring_path or current_path,
+                        start_from_beginning
+                    )
+
+                    for line in tail_file(f, poll_interval, encoding, waiter):
+                        alerts.poll()
+
+                        # If date changed while tailing, break to reopen new file. Checked on
+                        # idle ticks too: after midnight the old file simply stops growing.
+                        new_target = compute_log_path_cached(cfg)
+                        if new_target != current_path:
+                            logging.info("Date rollover while tailing. Switching to: %s", new_target)
+                            current_path = new_target
+                            if not ring_path:
+                                break
+
+                        if line is None:
+                            continue
+
+                        # Cheap reject before parsing: every log_generator line ends in the
+                        # last digit of a %.5e exponent (see log_generator.format_line), so
+                        # anything else (comments, partial writes) cannot be a reading.
+                        stripped = line.rstrip()
+                        if not stripped or stripped[-1] not in _DIGITS:
+                            logging.debug("Line does not end in a digit (skipped): %s", stripped)
+                            continue
+
+                        value = extract_rightmost_float(stripped)
+                        if value is None:
+                            logging.debug("No numeric value found in line (skipped): %s", line.strip())
+                            continue
+
+                        logging.debug("Parsed value: %s | line: %s", value, line.strip())
+
+                        if value > threshold:
                             logging.warning("Threshold exceeded: value=%s > %s", value, threshold)
-                            try:
-                                send_email_alert(cfg, value, line, current_path)
-                                last_alert_ts = now_ts
-                            except Exception as e:
-                                logging.error("Failed to send alert email: %s", e)
-                        else:
-                            logging.info(
-                                "Threshold exceeded but within cooldown (%.1fs remaining).",
-                                cooldown - (now_ts - last_alert_ts)
-                            )
-        except FileNotFoundError:
-            # If file vanished (rotation, cleanup), loop will try again
-            logging.info("File not found (may be rotating). Will retry: %s", current_path)
-            time.sleep(poll_interval)
-        except PermissionError as e:
-            logging.warning("Permission error opening file (locked?). Retrying. %s", e)
-            time.sleep(poll_interval)
-        except Exception as e:
-            logging.error("Unexpected error while monitoring: %s", e)
-            time.sleep(poll_interval)
+                            alerts.add(value, line, current_path)
+            except FileNotFoundError:
+                # If file vanished (rotation, cleanup), loop will try again
+                logging.info("File not found (may be rotating). Will retry: %s", current_path)
+                alerts.sleep(poll_interval)
+            except PermissionError as e:
+                logging.warning("Permission error opening file (locked?). Retrying. %s", e)
+                alerts.sleep(poll_interval)
+            except Exception as e:
+                logging.error("Unexpected error while monitoring: %s", e)
+                alerts.sleep(poll_interval)
+    finally:
+        alerts.close()
 
 def main(argv=None) -> int:
     r"""
@@ -345,6 +1010,8 @@ def main(argv=None) -> int:
     except KeyboardInterrupt:
         logging.info("Stopped by user.")
         return 0
+    finally:
+        close_mailer()
     return 0
 
 if __name__ == "__main__":
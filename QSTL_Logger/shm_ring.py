@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared-memory line ring
+-----------------------
+Lets log_generator.py hand log lines to monitor_temp_log.py through a memory-mapped
+file (e.g. /dev/shm/templog.ringbuf on Linux) so the monitor does not have to re-read
+the log file from disk. The log file is still written as usual; the ring is an
+optional side channel enabled with "shm_ring" in both configs.
+
+Layout:
+    [0:8)    magic b"TLRING01"
+    [8:16)   capacity (u64, little endian) -- size of the data area
+    [16:24)  tail (u64) -- total bytes ever written; updated after the data
+    [64:...) data area, written circularly at tail % capacity
+
+The writer copies data in first and then publishes the new tail with a single aligned
+8-byte store. Python issues no memory barrier around either, so "a reader that sees a
+tail value also sees the bytes before it" only holds on strongly ordered CPUs (x86,
+TSO). On weakly ordered CPUs such as ARM the reader can observe the new tail before
+the data, and a line may occasionally come through with stale bytes; use the plain
+file tail there.
+
+If the writer laps the reader (or resets the ring), read() raises RingOverrunError
+once so the caller can drop any partial line it is holding, then resumes at the next
+complete line.
+"""
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+MAGIC = b"TLRING01"
+HEADER_SIZE = 64
+DEFAULT_CAPACITY = 1 << 20
+
+_HEADER = struct.Struct("<8sQQ")
+_TAIL = struct.Struct("<Q")
+_TAIL_OFFSET = 16
+
+# Sleep between tail checks in RingReader.wait.
+WAIT_STEP_SECONDS = 0.01
+
+class RingOverrunError(Exception):
+    r"""Raised by RingReader.read when bytes since the last read were lost."""
+
+class RingWriter:
+    r"""
+    Producer side of the ring. Reuses an existing ring with the same capacity so a
+    restarted generator continues where it left off.
+    """
+    def __init__(self, path: Path, capacity: int = DEFAULT_CAPACITY):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = HEADER_SIZE + capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.capacity = capacity
+        magic, cap, tail = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or cap != capacity:
+            tail = 0
+            _HEADER.pack_into(self._mm, 0, MAGIC, capacity, tail)
+        self._tail = tail
+
+    def write(self, data: bytes) -> None:
+        r"""
+        Append bytes to the ring and publish the new tail.
+        Args:
+            data: Bytes to append; only the last `capacity` bytes are kept if larger.
+        """
+        n = len(data)
+        cap = self.capacity
+        tail = self._tail
+        if n > cap:
+            tail += n - cap
+            data = data[-cap:]
+            n = cap
+        start = tail % cap
+        first = min(n, cap - start)
+        self._mm[HEADER_SIZE + start:HEADER_SIZE + start + first] = data[:first]
+        if first < n:
+            self._mm[HEADER_SIZE:HEADER_SIZE + n - first] = data[first:]
+        self._tail = tail + n
+        _TAIL.pack_into(self._mm, _TAIL_OFFSET, self._tail)
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.close()
+
+class RingReader:
+    r"""
+    Consumer side of the ring. Provides read() like an unbuffered file, so it can be
+    passed to monitor_temp_log.tail_file, and wait() like FileChangeWaiter, which
+    polls the tail in the header instead of relying on file-change notifications.
+    """
+    def __init__(self, path: Path, from_start: bool = False):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, cap, tail = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or len(self._mm) < HEADER_SIZE + cap:
+            self._mm.close()
+            raise ValueError(f"Not a TempLog ring: {path}")
+        self.capacity = cap
+        self._pos = max(0, tail - cap) if from_start else tail
+        self._resync = from_start and tail > cap
+
+    def _tail(self) -> int:
+        return _TAIL.unpack_from(self._mm, _TAIL_OFFSET)[0]
+
+    def read(self, size: int = -1) -> bytes:
+        r"""
+        Return up to size bytes written since the last read (all of them if size < 0).
+        If the writer lapped the reader, skips ahead and drops the partial line.
+        Returns:
+            New bytes, or b"" if nothing was written.
+        Raises:
+            RingOverrunError: If data was lost since the last read; bytes returned
+                earlier may end in a line whose remainder is gone. The next read
+                starts at the next complete line.
+        """
+        cap = self.capacity
+        tail = self._tail()
+        if tail < self._pos:
+            logging.warning("Shared ring was reset by the writer; restarting from its start")
+            self._pos = 0
+            raise RingOverrunError("ring reset by writer")
+        if tail - self._pos > cap:
+            logging.warning("Shared ring overrun; skipped %d bytes", tail - cap - self._pos)
+            self._pos = tail - cap
+            self._resync = True
+            raise RingOverrunError("reader lapped by writer")
+        n = tail - self._pos
+        if 0 <= size < n:
+            n = size
+        if n == 0:
+            return b""
+        start = self._pos % cap
+        first = min(n, cap - start)
+        data = self._mm[HEADER_SIZE + start:HEADER_SIZE + start + first]
+        if first < n:
+            data += self._mm[HEADER_SIZE:HEADER_SIZE + n - first]
+        if self._tail() - self._pos > cap:
+            # Overwritten while copying; retry from the new position.
+            return self.read(size)
+        self._pos += n
+        if self._resync:
+            nl = data.find(b"\n")
+            if nl < 0:
+                return b""
+            self._resync = False
+            data = data[nl + 1:]
+        return data
+
+    def wait(self, timeout: float) -> None:
+        r"""
+        Block until the writer publishes new data or timeout seconds have passed.
+        Args:
+            timeout: Maximum seconds to block.
+        """
+        deadline = time.monotonic() + timeout
+        while self._tail() == self._pos:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(WAIT_STEP_SECONDS, remaining))
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,14 +1,16 @@
 import os
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 
-client = WebClient(token="")
+if __name__ == "__main__":
+    from slack_sdk import WebClient
+    from slack_sdk.errors import SlackApiError
 
-try:
-    resp = client.chat_postMessage(
-        channel="",
-        text="Hello world"
-    )
-    print("sent ts:", resp["ts"])
-except SlackApiError as e:
-    print("error:", e.response.get("error"))
+    client = WebClient(token="")
+
+    try:
+        resp = client.chat_postMessage(
+            channel="",
+            text="Hello world"
+        )
+        print("sent ts:", resp["ts"])
+    except SlackApiError as e:
+        print("error:", e.response.get("error"))